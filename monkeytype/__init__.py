@@ -6,7 +6,7 @@
 from typing import ContextManager, Optional
 
 from monkeytype.config import Config, get_default_config
-from monkeytype.tracing import trace_calls
+from monkeytype.tracing import pause_tracing, trace_calls  # noqa: F401
 
 
 def trace(config: Optional[Config] = None) -> ContextManager[None]:
@@ -84,6 +84,8 @@ def __are_typed_dict_types_equal(type1: type, type2: type) -> bool:
     Doing this explicitly because
     TypedDict('Foo', {'a': int}) != TypedDict('Foo', {'a': int})."""
 
+    if type1 is type2:
+        return True
     if not is_typed_dict(type2):
         return False
     total1 = getattr(type1, "__total__", True)
@@ -96,7 +98,9 @@ def __are_typed_dict_types_equal(type1: type, type2: type) -> bool:
 
 
 def types_equal(typ: type, other_type: type) -> bool:
-    return typ == other_type
+    # Anonymous TypedDicts are shared (see make_typed_dict), so identical
+    # types are common and needn't be compared structurally.
+    return typ is other_type or typ == other_type
 
 
 # HACK: MonkeyType monkey-patches _TypedDictMeta!
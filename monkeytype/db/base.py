@@ -68,5 +68,9 @@ class CallTraceStoreLogger(CallTraceLogger):
             self.traces.append(trace)
 
     def flush(self) -> None:
+        # Nothing was logged; don't bother the store (e.g. with an empty
+        # database transaction).
+        if not self.traces:
+            return
         self.store.add(self.traces)
         self.traces = []
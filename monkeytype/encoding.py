@@ -49,6 +49,9 @@ def typed_dict_to_dict(typ: type) -> TypeDict:
     }
 
 
+_BARE_GENERICS = (Dict, List, Tuple)
+
+
 def type_to_dict(typ: type) -> TypeDict:
     """Convert a type into a dictionary representation that we can store.
 
@@ -73,9 +76,13 @@ def type_to_dict(typ: type) -> TypeDict:
         "qualname": qualname,
     }
     elem_types = getattr(typ, "__args__", None)
-    # In Python < 3.9, bare generics still have args
-    is_bare_generic = typ in {Dict, List, Tuple}
-    if not is_bare_generic and elem_types is not None and is_generic(typ):
+    # In Python < 3.9, bare generics still have args. Check for them last:
+    # hashing a parameterized generic (for a set lookup) hashes all its args.
+    if (
+        elem_types is not None
+        and is_generic(typ)
+        and not any(typ is g for g in _BARE_GENERICS)
+    ):
         # empty typing.Tuple is weird; the spec says it should be Tuple[()],
         # which results in __args__ of `((),)` pre-Python 3.11
         if elem_types == ((),):
@@ -9,8 +9,9 @@ import random
 import sys
 from abc import ABCMeta, abstractmethod
 from contextlib import contextmanager
+from contextvars import ContextVar
 from types import CodeType, FrameType
-from typing import Any, Callable, Dict, Iterator, Optional, Union, cast
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union, cast
 
 import opcode
 
@@ -47,7 +48,12 @@ class CallTrace:
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return (
+                self.func == other.func
+                and self.arg_types == other.arg_types
+                and self.return_type == other.return_type
+                and self.yield_type == other.yield_type
+            )
         return NotImplemented
 
     def __repr__(self) -> str:
@@ -180,13 +186,18 @@ RETURN_VALUE_OPCODE = opcode.opmap["RETURN_VALUE"]
 YIELD_VALUE_OPCODE = opcode.opmap["YIELD_VALUE"]
 
 # A CodeFilter is a predicate that decides whether or not a the call for the
-# supplied code object should be traced.
+# supplied code object should be traced. CallTracer only consults it once per
+# code object and caches the decision.
 CodeFilter = Callable[[CodeType], bool]
 
 EVENT_CALL = "call"
 EVENT_RETURN = "return"
 SUPPORTED_EVENTS = {EVENT_CALL, EVENT_RETURN}
 
+# Set by pause_tracing(); a context variable rather than a global so that
+# pausing in one thread or asyncio task doesn't affect the others.
+_tracing_paused: ContextVar[bool] = ContextVar("tracing_paused", default=False)
+
 
 class CallTracer:
     """CallTracer captures the concrete types involved in a function invocation.
@@ -214,15 +225,32 @@ class CallTracer:
         self.sample_rate = sample_rate
         self.cache: Dict[CodeType, Optional[Callable[..., Any]]] = {}
         self.should_trace = code_filter
+        self.filter_cache: Dict[CodeType, bool] = {}
+        self.arg_names_cache: Dict[CodeType, Tuple[str, ...]] = {}
         self.max_typed_dict_size = max_typed_dict_size
 
+    def _should_trace(self, code: CodeType) -> bool:
+        if self.should_trace is None:
+            return True
+        try:
+            return self.filter_cache[code]
+        except KeyError:
+            should_trace = self.filter_cache[code] = bool(self.should_trace(code))
+            return should_trace
+
     def _get_func(self, frame: FrameType) -> Optional[Callable[..., Any]]:
         code = frame.f_code
-        if code not in self.cache:
-            self.cache[code] = get_func(frame)
-        return self.cache[code]
+        # get_func may legitimately return None, so a hit can't be detected
+        # with .get(); a cache hit costs a single lookup this way.
+        try:
+            return self.cache[code]
+        except KeyError:
+            func = self.cache[code] = get_func(frame)
+            return func
 
     def handle_call(self, frame: FrameType) -> None:
+        if _tracing_paused.get():
+            return
         if self.sample_rate and random.randrange(self.sample_rate) != 0:
             return
         func = self._get_func(frame)
@@ -234,12 +262,18 @@ class CallTracer:
         if frame in self.traces:
             # resuming a generator; we've already seen this frame
             return
-        arg_names = code.co_varnames[: code.co_argcount + code.co_kwonlyargcount]
+        arg_names = self.arg_names_cache.get(code)
+        if arg_names is None:
+            arg_names = code.co_varnames[: code.co_argcount + code.co_kwonlyargcount]
+            self.arg_names_cache[code] = arg_names
+        # Every access to frame.f_locals re-syncs the locals dict from the
+        # frame's fast locals, so only do it once.
+        f_locals = frame.f_locals
         arg_types = {}
         for name in arg_names:
-            if name in frame.f_locals:
+            if name in f_locals:
                 arg_types[name] = get_type(
-                    frame.f_locals[name], max_typed_dict_size=self.max_typed_dict_size
+                    f_locals[name], max_typed_dict_size=self.max_typed_dict_size
                 )
         self.traces[frame] = CallTrace(func, arg_types)
 
@@ -264,13 +298,12 @@ class CallTracer:
             self.logger.log(trace)
 
     def __call__(self, frame: FrameType, event: str, arg: Any) -> "CallTracer":
+        # The profiler also reports c_call/c_return/c_exception for every
+        # builtin call; reject those before touching the frame at all.
+        if event not in SUPPORTED_EVENTS:
+            return self
         code = frame.f_code
-        if (
-            event not in SUPPORTED_EVENTS
-            or code.co_name == "trace_types"
-            or self.should_trace
-            and not self.should_trace(code)
-        ):
+        if code.co_name == "trace_types" or not self._should_trace(code):
             return self
         try:
             if event == EVENT_CALL:
@@ -299,3 +332,17 @@ def trace_calls(
     finally:
         sys.setprofile(old_trace)
         logger.flush()
+
+
+@contextmanager
+def pause_tracing() -> Iterator[None]:
+    """Don't trace calls made within the block, even if tracing is enabled.
+
+    Calls that were already in progress when the block was entered are still
+    traced when they return.
+    """
+    token = _tracing_paused.set(True)
+    try:
+        yield
+    finally:
+        _tracing_paused.reset(token)
@@ -56,19 +56,45 @@ def make_typed_dict(*, required_fields=None, optional_fields=None) -> type:
     required_fields = required_fields or {}
     optional_fields = optional_fields or {}
     assert required_fields.keys().isdisjoint(optional_fields.keys())
+    # Field order is preserved (not sorted) because it determines the order
+    # fields are rendered in stubs.
+    required_items = tuple(required_fields.items())
+    optional_items = tuple(optional_fields.items())
+    try:
+        typed_dict = _make_typed_dict_cached(required_items, optional_items)
+    except TypeError:
+        # An unhashable field type; build the TypedDict without the cache.
+        return _make_typed_dict(required_items, optional_items)
+    # The cache matches field types with ==, but equal types can be spelled
+    # differently (Union[int, str] == Union[str, int]) and the spelling shows
+    # up in stubs. Only reuse the cached class if it has the very same types.
+    cached_required, cached_optional = field_annotations(typed_dict)
+    if any(cached_required[k] is not v for k, v in required_items) or any(
+        cached_optional[k] is not v for k, v in optional_items
+    ):
+        return _make_typed_dict(required_items, optional_items)
+    return typed_dict
+
+
+def _make_typed_dict(required_items, optional_items) -> type:
     return TypedDict(
         DUMMY_TYPED_DICT_NAME,
         {
             "required_fields": TypedDict(
-                DUMMY_REQUIRED_TYPED_DICT_NAME, required_fields
+                DUMMY_REQUIRED_TYPED_DICT_NAME, dict(required_items)
             ),
             "optional_fields": TypedDict(
-                DUMMY_OPTIONAL_TYPED_DICT_NAME, optional_fields
+                DUMMY_OPTIONAL_TYPED_DICT_NAME, dict(optional_items)
             ),
         },
     )
 
 
+# Creating a TypedDict class is expensive and the same small shapes recur
+# constantly while tracing, so share one class per distinct set of fields.
+_make_typed_dict_cached = functools.lru_cache(maxsize=2048)(_make_typed_dict)
+
+
 def field_annotations(typed_dict) -> Tuple[Dict[str, type], Dict[str, type]]:
     """Return the required and optional fields in the TypedDict."""
     return (
@@ -82,6 +108,19 @@ def is_anonymous_typed_dict(typ: type) -> bool:
     return is_typed_dict(typ) and typ.__name__ == DUMMY_TYPED_DICT_NAME
 
 
+def _contains_anonymous_typed_dict(typ) -> bool:
+    """Return true if an anonymous TypedDict appears anywhere within typ."""
+    if is_typed_dict(typ):
+        return typ.__name__ == DUMMY_TYPED_DICT_NAME or any(
+            _contains_anonymous_typed_dict(t) for t in typ.__annotations__.values()
+        )
+    if is_generic(typ):
+        return any(
+            _contains_anonymous_typed_dict(t) for t in getattr(typ, "__args__", ())
+        )
+    return False
+
+
 def shrink_typed_dict_types(typed_dicts: List[type], max_typed_dict_size: int) -> type:
     """Shrink a list of TypedDicts into one with the required fields and the optional fields.
     Required fields are keys that appear as a required field in all the TypedDicts.
@@ -157,8 +196,15 @@ def shrink_types(types, max_typed_dict_size):
         )
         return List[annotation]
 
+    # Most types contain no anonymous TypedDict; checking is much cheaper
+    # than rebuilding them unchanged.
     all_dict_types = tuple(
-        RewriteAnonymousTypedDictToDict().rewrite(typ) for typ in types
+        (
+            RewriteAnonymousTypedDictToDict().rewrite(typ)
+            if _contains_anonymous_typed_dict(typ)
+            else typ
+        )
+        for typ in types
     )
     return Union[all_dict_types]
 
@@ -179,6 +225,11 @@ _BUILTIN_CALLABLE_TYPES = (
     types.BuiltinFunctionType,
 )
 
+# Types of empty containers, built once instead of on every traced call.
+_EMPTY_DICT_TYPE = Dict[Any, Any]
+_EMPTY_LIST_TYPE = List[Any]
+_EMPTY_SET_TYPE = Set[Any]
+
 
 def get_dict_type(dct, max_typed_dict_size):
     """Return a TypedDict for `dct` if all the keys are strings.
@@ -187,7 +238,7 @@ def get_dict_type(dct, max_typed_dict_size):
         # Special-case this because returning an empty TypedDict is
         # unintuitive, especially when you've "disabled" TypedDict generation
         # by setting `max_typed_dict_size` to 0.
-        return Dict[Any, Any]
+        return _EMPTY_DICT_TYPE
     if all(isinstance(k, str) for k in dct.keys()) and (
         max_typed_dict_size is None or len(dct) <= max_typed_dict_size
     ):
@@ -209,19 +260,33 @@ def get_dict_type(dct, max_typed_dict_size):
 
 def get_type(obj, max_typed_dict_size):
     """Return the static type that would be used in a type hint"""
-    if isinstance(obj, type):
-        return Type[obj]
-    elif isinstance(obj, _BUILTIN_CALLABLE_TYPES):
-        return Callable
-    elif isinstance(obj, types.GeneratorType):
-        return Iterator[Any]
     typ = type(obj)
+    # The most common argument and return values; their type is the type hint.
+    # Compare by identity: a set lookup would hash typ, and classes whose
+    # metaclass defines __eq__ without __hash__ are unhashable.
+    if (
+        typ is int
+        or typ is str
+        or typ is float
+        or typ is bool
+        or typ is NoneType
+        or typ is bytes
+        or typ is complex
+        or typ is bytearray
+    ):
+        return typ
+    # Builtin containers are matched by exact type, so they can be handled
+    # before the (slower) isinstance checks below.
     if typ is list:
+        if not obj:
+            return _EMPTY_LIST_TYPE
         elem_type = shrink_types(
             (get_type(e, max_typed_dict_size) for e in obj), max_typed_dict_size
         )
         return List[elem_type]
     elif typ is set:
+        if not obj:
+            return _EMPTY_SET_TYPE
         elem_type = shrink_types(
             (get_type(e, max_typed_dict_size) for e in obj), max_typed_dict_size
         )
@@ -239,6 +304,12 @@ def get_type(obj, max_typed_dict_size):
         return DefaultDict[key_type, val_type]
     elif typ is tuple:
         return Tuple[tuple(get_type(e, max_typed_dict_size) for e in obj)]
+    elif isinstance(obj, type):
+        return Type[obj]
+    elif isinstance(obj, _BUILTIN_CALLABLE_TYPES):
+        return Callable
+    elif typ is types.GeneratorType:
+        return Iterator[Any]
     return typ
 
 
@@ -398,6 +469,12 @@ class RemoveEmptyContainers(TypeRewriter):
 
     def rewrite_Union(self, union):
         elems = tuple(self.rewrite(e) for e in union.__args__ if not self._is_empty(e))
+        if len(elems) == len(union.__args__) and all(
+            a is b for a, b in zip(elems, union.__args__)
+        ):
+            # Nothing was removed or rewritten; don't rebuild the Union. Compare
+            # by identity, as a rewritten member may still compare equal.
+            return union
         if elems:
             return Union[elems]
         return union
@@ -76,7 +76,10 @@ def get_name_in_module(
     return obj
 
 
+_NON_ALPHANUMERIC_RE = re.compile("([^a-zA-Z0-9])")
+
+
 def pascal_case(s: str) -> str:
     return "".join(
-        a[0].upper() + a[1:] for a in re.split("([^a-zA-Z0-9])", s) if a.isalnum()
+        a[0].upper() + a[1:] for a in _NON_ALPHANUMERIC_RE.split(s) if a.isalnum()
     )
@@ -40,3 +40,10 @@ def test_round_trip(logger):
 
     assert not logger.store.filter('__main__')
     assert logger.store.filter(normal_func.__module__)
+
+
+def test_flush_without_traces_skips_store(logger):
+    with patch.object(logger.store, 'add') as add:
+        with trace_calls(logger, max_typed_dict_size=0):
+            pass
+    add.assert_not_called()
@@ -54,12 +54,25 @@ from monkeytype.stubs import (
 from monkeytype.tracing import CallTrace
 from monkeytype.typing import NoneType, make_typed_dict
 from mypy_extensions import TypedDict
-from .util import Dummy
+from .util import Dummy, Outer
 
+_DUMMY_MODULE = Dummy.__module__
 UserId = NewType('UserId', int)
 T = TypeVar("T")
 
 
+@pytest.fixture(scope='session')
+def dummy_signatures():
+    """Signatures of the Dummy callables that several tests introspect."""
+    funcs = [
+        Dummy.a_static_method,
+        Dummy.a_property.fget,
+    ]
+    if cached_property:
+        funcs.append(Dummy.a_cached_property.func)
+    return {func: Signature.from_callable(func) for func in funcs}
+
+
 class TestImportMap:
     def test_merge(self):
         a = ImportMap()
@@ -157,6 +170,13 @@ def has_length_exceeds_120_chars(
     return None
 
 
+_EXPECTED_SPLIT = dedent('''\
+    def has_length_exceeds_120_chars(
+        very_long_name_parameter_1: float,
+        very_long_name_parameter_2: float
+    ) -> Optional[float]: ...''')
+
+
 def has_newtype_param(user_id: UserId) -> None:
     pass
 
@@ -222,16 +242,16 @@ class TestFunctionStub:
         ])
         assert stub.render() == expected
 
-    def test_staticmethod(self):
-        stub = FunctionStub('test', inspect.signature(Dummy.a_static_method), FunctionKind.STATIC)
+    def test_staticmethod(self, dummy_signatures):
+        stub = FunctionStub('test', dummy_signatures[Dummy.a_static_method], FunctionKind.STATIC)
         expected = "\n".join([
             '@staticmethod',
             'def test%s: ...' % (render_signature(stub.signature),),
         ])
         assert stub.render() == expected
 
-    def test_property(self):
-        stub = FunctionStub('test', inspect.signature(Dummy.a_property.fget), FunctionKind.PROPERTY)
+    def test_property(self, dummy_signatures):
+        stub = FunctionStub('test', dummy_signatures[Dummy.a_property.fget], FunctionKind.PROPERTY)
         expected = "\n".join([
             '@property',
             'def test%s: ...' % (render_signature(stub.signature),),
@@ -239,9 +259,9 @@ class TestFunctionStub:
         assert stub.render() == expected
 
     @skipIf(cached_property is None, "install Django to run this test")
-    def test_cached_property(self):
+    def test_cached_property(self, dummy_signatures):
         stub = FunctionStub('test',
-                            inspect.signature(Dummy.a_cached_property.func), FunctionKind.DJANGO_CACHED_PROPERTY)
+                            dummy_signatures[Dummy.a_cached_property.func], FunctionKind.DJANGO_CACHED_PROPERTY)
         expected = "\n".join([
             '@cached_property',
             'def test%s: ...' % (render_signature(stub.signature),),
@@ -261,7 +281,7 @@ class TestFunctionStub:
 
     def test_strip_modules(self):
         """We should strip modules from annotations in the signature"""
-        to_strip = [Dummy.__module__]
+        to_strip = (_DUMMY_MODULE,)
         f = strip_modules_helper
         stub = FunctionStub(f.__name__, inspect.signature(f), FunctionKind.MODULE, to_strip)
         expected = 'def strip_modules_helper(d1: Dummy, d2: Dummy) -> None: ...'
@@ -295,12 +315,7 @@ class TestFunctionStub:
         stub = FunctionStub('has_length_exceeds_120_chars',
                             inspect.signature(has_length_exceeds_120_chars),
                             FunctionKind.MODULE)
-        expected = dedent('''\
-        def has_length_exceeds_120_chars(
-            very_long_name_parameter_1: float,
-            very_long_name_parameter_2: float
-        ) -> Optional[float]: ...''')
-        assert stub.render() == expected
+        assert stub.render() == _EXPECTED_SPLIT
 
         expected = '\n'.join([
             '    def has_length_exceeds_120_chars(',
@@ -343,10 +358,10 @@ class TestFunctionStub:
         assert stub.render() == expected
 
 
-def _func_stub_from_callable(func: Callable, strip_modules: List[str] = None):
+def _func_stub_from_callable(func: Callable, strip_modules: Tuple[str, ...] = ()):
     kind = FunctionKind.from_callable(func)
     sig = Signature.from_callable(func)
-    return FunctionStub(func.__name__, sig, kind, strip_modules)
+    return FunctionStub(func.__name__, sig, kind, list(strip_modules))
 
 
 class TestClassStub:
@@ -831,7 +846,7 @@ class TestBuildModuleStubs:
             FunctionDefinition.from_callable(simple_add),
         ]
         simple_add_stub = _func_stub_from_callable(simple_add)
-        to_strip = ['typing']
+        to_strip = ('typing',)
         dummy_stub = ClassStub('Dummy', function_stubs=[
             _func_stub_from_callable(Dummy.a_class_method.__func__, to_strip),
             _func_stub_from_callable(Dummy.an_instance_method, to_strip),
@@ -840,7 +855,7 @@ class TestBuildModuleStubs:
         imports = {'typing': {'Any', 'Optional'}}
         expected = {
             'tests.test_stubs': ModuleStub(function_stubs=[simple_add_stub]),
-            'tests.util': ModuleStub(class_stubs=[dummy_stub], imports_stub=ImportBlockStub(imports)),
+            _DUMMY_MODULE: ModuleStub(class_stubs=[dummy_stub], imports_stub=ImportBlockStub(imports)),
         }
         self.maxDiff = None
         assert build_module_stubs(entries) == expected
@@ -1061,78 +1076,79 @@ async def an_async_func() -> None:
     pass
 
 
-class TestFunctionKind:
-    cases = [
-        (Dummy.a_static_method, FunctionKind.STATIC),
-        (Dummy.a_class_method.__func__, FunctionKind.CLASS),
-        (Dummy.an_instance_method, FunctionKind.INSTANCE),
-        (Dummy.a_property.fget, FunctionKind.PROPERTY),
-        (a_module_func, FunctionKind.MODULE),
-    ]
-    if cached_property:
-        cases.append((Dummy.a_cached_property.func, FunctionKind.DJANGO_CACHED_PROPERTY))
+# (callable, expected FunctionKind, expected has_self)
+_CALLABLE_TABLE = [
+    (Dummy.a_static_method, FunctionKind.STATIC, False),
+    (Dummy.a_class_method.__func__, FunctionKind.CLASS, True),
+    (Dummy.an_instance_method, FunctionKind.INSTANCE, True),
+    (Dummy.a_property.fget, FunctionKind.PROPERTY, True),
+    (a_module_func, FunctionKind.MODULE, False),
+]
+_CALLABLE_IDS = ['static', 'classmethod', 'instance', 'property', 'module']
+if cached_property:
+    _CALLABLE_TABLE.append((Dummy.a_cached_property.func, FunctionKind.DJANGO_CACHED_PROPERTY, True))
+    _CALLABLE_IDS.append('cached_property')
+
 
+class TestFunctionKind:
     @pytest.mark.parametrize(
         'func, expected',
-        cases,
+        [(func, kind) for func, kind, _ in _CALLABLE_TABLE],
+        ids=_CALLABLE_IDS,
     )
     def test_from_callable(self, func, expected):
         assert FunctionKind.from_callable(func) == expected
 
 
 class TestFunctionDefinition:
-    cases = [
-        (Dummy.a_static_method, False),
-        (Dummy.a_class_method.__func__, True),
-        (Dummy.an_instance_method, True),
-        (Dummy.a_property.fget, True),
-        (a_module_func, False),
-    ]
-    if cached_property:
-        cases.append((Dummy.a_cached_property.func, True))
-
     @pytest.mark.parametrize(
         'func, expected',
-        cases,
+        [(func, has_self) for func, _, has_self in _CALLABLE_TABLE],
+        ids=_CALLABLE_IDS,
     )
     def test_has_self(self, func, expected):
         defn = FunctionDefinition.from_callable(func)
         assert defn.has_self == expected
 
+    # The expected definitions are built lazily so that introspecting the
+    # callables only happens for the cases that are actually selected.
     cases = [
-        (Dummy.a_static_method, FunctionDefinition(
+        (Dummy.a_static_method, lambda: FunctionDefinition(
             'tests.util', 'Dummy.a_static_method', FunctionKind.STATIC,
             Signature.from_callable(Dummy.a_static_method))),
-        (Dummy.a_class_method.__func__, FunctionDefinition(
+        (Dummy.a_class_method.__func__, lambda: FunctionDefinition(
             'tests.util', 'Dummy.a_class_method', FunctionKind.CLASS,
             Signature.from_callable(Dummy.a_class_method.__func__))),
-        (Dummy.an_instance_method, FunctionDefinition(
+        (Dummy.an_instance_method, lambda: FunctionDefinition(
             'tests.util', 'Dummy.an_instance_method', FunctionKind.INSTANCE,
             Signature.from_callable(Dummy.an_instance_method))),
-        (Dummy.a_property.fget, FunctionDefinition(
+        (Dummy.a_property.fget, lambda: FunctionDefinition(
             'tests.util', 'Dummy.a_property', FunctionKind.PROPERTY,
             Signature.from_callable(Dummy.a_property.fget))),
-        (a_module_func, FunctionDefinition(
+        (a_module_func, lambda: FunctionDefinition(
             'tests.test_stubs', 'a_module_func', FunctionKind.MODULE,
             Signature.from_callable(a_module_func))),
-        (an_async_func, FunctionDefinition(
+        (an_async_func, lambda: FunctionDefinition(
             'tests.test_stubs', 'an_async_func', FunctionKind.MODULE,
             Signature.from_callable(a_module_func), is_async=True)),
     ]
+    ids = ['static', 'classmethod', 'instance', 'property', 'module', 'async']
     if cached_property:
         cases.append(
-            (Dummy.a_cached_property.func, FunctionDefinition(
+            (Dummy.a_cached_property.func, lambda: FunctionDefinition(
                 'tests.util', 'Dummy.a_cached_property', FunctionKind.DJANGO_CACHED_PROPERTY,
                 Signature.from_callable(Dummy.a_cached_property.func)))
         )
+        ids.append('cached_property')
 
     @pytest.mark.parametrize(
-        'func, expected',
+        'func, expected_factory',
         cases,
+        ids=ids,
     )
-    def test_from_callable(self, func, expected):
+    def test_from_callable(self, func, expected_factory):
         defn = FunctionDefinition.from_callable(func)
-        assert defn == expected
+        assert defn == expected_factory()
 
     @pytest.mark.parametrize(
         'func, arg_types, return_type, yield_type, expected',
@@ -1218,32 +1234,39 @@ def tie_helper(a, b):
     pass
 
 
+_SHRINK_ARG_TRACES = (
+    CallTrace(tie_helper, {'a': str, 'b': int}),
+    CallTrace(tie_helper, {'a': str, 'b': NoneType}),
+)
+_SHRINK_RETURN_TRACES = (
+    CallTrace(tie_helper, {}, NoneType),
+    CallTrace(tie_helper, {}, str),
+)
+_SHRINK_YIELD_TRACES = (
+    CallTrace(tie_helper, {}, yield_type=int),
+    CallTrace(tie_helper, {}, yield_type=str),
+)
+
+
 class TestShrinkTracedTypes:
     def test_shrink_args(self):
-        traces = [
-            CallTrace(tie_helper, {'a': str, 'b': int}),
-            CallTrace(tie_helper, {'a': str, 'b': NoneType}),
-        ]
-        assert shrink_traced_types(traces, max_typed_dict_size=0) == ({'a': str, 'b': Optional[int]}, None, None)
+        assert shrink_traced_types(_SHRINK_ARG_TRACES, max_typed_dict_size=0) == (
+            {'a': str, 'b': Optional[int]}, None, None)
 
     def test_shrink_return(self):
-        traces = [
-            CallTrace(tie_helper, {}, NoneType),
-            CallTrace(tie_helper, {}, str),
-        ]
-        assert shrink_traced_types(traces, max_typed_dict_size=0) == ({}, Optional[str], None)
+        assert shrink_traced_types(_SHRINK_RETURN_TRACES, max_typed_dict_size=0) == ({}, Optional[str], None)
 
     def test_shrink_yield(self):
-        traces = [
-            CallTrace(tie_helper, {}, yield_type=int),
-            CallTrace(tie_helper, {}, yield_type=str),
-        ]
-        assert shrink_traced_types(traces, max_typed_dict_size=0) == ({}, None, Union[int, str])
+        assert shrink_traced_types(_SHRINK_YIELD_TRACES, max_typed_dict_size=0) == ({}, None, Union[int, str])
 
 
-class Parent:
-    class Child:
-        pass
+_DUMMY_IMPORTS = {_DUMMY_MODULE: frozenset({'Dummy'})}
+_DUMMY_DICT_IMPORTS = {**_DUMMY_IMPORTS, 'typing': frozenset({'Dict'})}
+_DUMMY_LIST_IMPORTS = {**_DUMMY_IMPORTS, 'typing': frozenset({'List'})}
+_DUMMY_SET_IMPORTS = {**_DUMMY_IMPORTS, 'typing': frozenset({'Set'})}
+_DUMMY_TUPLE_IMPORTS = {**_DUMMY_IMPORTS, 'typing': frozenset({'Tuple'})}
+_DUMMY_TYPE_IMPORTS = {**_DUMMY_IMPORTS, 'typing': frozenset({'Type'})}
+_DUMMY_UNION_IMPORTS = {**_DUMMY_IMPORTS, 'typing': frozenset({'Union'})}
 
 
 class TestGetImportsForAnnotation:
@@ -1275,17 +1298,17 @@ class TestGetImportsForAnnotation:
         assert get_imports_for_annotation(Callable) == {'typing': {'Callable'}}
 
     def test_user_defined_class(self):
-        assert get_imports_for_annotation(Dummy) == {'tests.util': {'Dummy'}}
+        assert get_imports_for_annotation(Dummy) == _DUMMY_IMPORTS
 
     @pytest.mark.parametrize(
         'anno, expected',
         [
-            (Dict[str, Dummy], {'tests.util': {'Dummy'}, 'typing': {'Dict'}}),
-            (List[Dummy], {'tests.util': {'Dummy'}, 'typing': {'List'}}),
-            (Set[Dummy], {'tests.util': {'Dummy'}, 'typing': {'Set'}}),
-            (Tuple[str, Dummy], {'tests.util': {'Dummy'}, 'typing': {'Tuple'}}),
-            (Type[Dummy], {'tests.util': {'Dummy'}, 'typing': {'Type'}}),
-            (Union[str, Dummy], {'tests.util': {'Dummy'}, 'typing': {'Union'}}),
+            (Dict[str, Dummy], _DUMMY_DICT_IMPORTS),
+            (List[Dummy], _DUMMY_LIST_IMPORTS),
+            (Set[Dummy], _DUMMY_SET_IMPORTS),
+            (Tuple[str, Dummy], _DUMMY_TUPLE_IMPORTS),
+            (Type[Dummy], _DUMMY_TYPE_IMPORTS),
+            (Union[str, Dummy], _DUMMY_UNION_IMPORTS),
         ],
     )
     def test_container_types(self, anno, expected):
@@ -1293,7 +1316,7 @@ class TestGetImportsForAnnotation:
         assert get_imports_for_annotation(anno) == expected
 
     def test_nested_class(self):
-        assert get_imports_for_annotation(Parent.Child) == {Parent.__module__: {'Parent'}}
+        assert get_imports_for_annotation(Outer.Inner) == {Outer.__module__: {'Outer'}}
 
 
 class TestGetImportsForSignature:
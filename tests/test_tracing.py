@@ -3,7 +3,7 @@
 #
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
-import inspect
+import sys
 from types import FrameType
 from typing import (
     Callable,
@@ -19,6 +19,7 @@ from monkeytype.tracing import (
     CallTrace,
     CallTraceLogger,
     get_func,
+    pause_tracing,
     trace_calls,
 )
 from monkeytype.typing import NoneType
@@ -47,33 +48,33 @@ def uses_kw_only_arg(a: int, *, b: int) -> int:
 
 def has_locals(foo: str) -> Optional[FrameType]:
         bar = 'baz'  # noqa - Needed to ensure non-argument locals are present in the returned frame
-        return inspect.currentframe()
+        return sys._getframe(0)
 
 
 class GetFuncHelper:
     @staticmethod
     def a_static_method() -> Optional[FrameType]:
-        return inspect.currentframe()
+        return sys._getframe(0)
 
     @classmethod
     def a_class_method(cls) -> Optional[FrameType]:
-        return inspect.currentframe()
+        return sys._getframe(0)
 
     def an_instance_method(self) -> Optional[FrameType]:
-        return inspect.currentframe()
+        return sys._getframe(0)
 
     @property
     def a_property(self) -> Optional[FrameType]:
-        return inspect.currentframe()
+        return sys._getframe(0)
 
     if cached_property:
         @cached_property
         def a_cached_property(self) -> Optional[FrameType]:
-            return inspect.currentframe()
+            return sys._getframe(0)
 
 
 def a_module_function() -> Optional[FrameType]:
-    return inspect.currentframe()
+    return sys._getframe(0)
 
 
 class TestGetFunc:
@@ -301,6 +302,28 @@ class TestTraceCalls:
             explicit_return_none()
         assert collector.traces == [CallTrace(simple_add, {'a': int, 'b': int}, int)]
 
+    def test_pause_tracing(self, collector):
+        """Calls made while tracing is paused should not be traced"""
+        with trace_calls(collector, max_typed_dict_size=0, code_filter=lambda code: code.co_filename == __file__):
+            with pause_tracing():
+                simple_add(1, 2)
+            explicit_return_none()
+        assert collector.traces == [CallTrace(explicit_return_none, {}, NoneType)]
+
+    def test_filter_called_once_per_code(self, collector):
+        """The code filter's decision should be cached for each code object"""
+        seen = []
+
+        def code_filter(code):
+            seen.append(code)
+            return code.co_name == 'simple_add'
+
+        with trace_calls(collector, max_typed_dict_size=0, code_filter=code_filter):
+            simple_add(1, 2)
+            simple_add(3, 4)
+        assert seen.count(simple_add.__code__) == 1
+        assert len(collector.traces) == 2
+
     def test_lazy_value(self, collector):
         """Check that function lookup does not invoke custom descriptors.
 
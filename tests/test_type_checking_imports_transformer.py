@@ -3,6 +3,7 @@
 #
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
+from textwrap import dedent
 from typing import Type, List
 
 from libcst.codemod import CodemodTest, Codemod, CodemodContext
@@ -13,47 +14,35 @@ from monkeytype.type_checking_imports_transformer import (
 )
 
 
-class TestMoveImportsToTypeCheckingBlockVisitor(CodemodTest):
-
-    TRANSFORM: Type[Codemod] = MoveImportsToTypeCheckingBlockVisitor
-
-    def run_test_case(
-        self,
-        import_items_to_be_moved: List[ImportItem],
-        before: str,
-        after: str,
-    ) -> None:
-        context = CodemodContext()
-        MoveImportsToTypeCheckingBlockVisitor.store_imports_in_context(
-            context,
-            import_items_to_be_moved,
-        )
-        self.assertCodemod(before, after, context_override=context)
-
-    def test_simple_add_type_checking(self):
-        source = """
+# name -> (import items to be moved, source, expected). Sources are dedented
+# once at import so assertCodemod receives canonical, already-dedented text.
+CASES = {
+    'simple_add_type_checking': (
+        [
+            ImportItem('a', 'B'),
+            ImportItem('c.C'),
+        ],
+        dedent("""
             from __future__ import annotations
 
             from a import B
             import c.C
-        """
-        import_items_to_be_moved = [
-            ImportItem('a', 'B'),
-            ImportItem('c.C'),
-        ]
-        expected = """
+        """),
+        dedent("""
             from __future__ import annotations
             from typing import TYPE_CHECKING
 
             if TYPE_CHECKING:
                 import c.C
                 from a import B
-        """
-
-        self.run_test_case(import_items_to_be_moved, source, expected)
-
-    def test_type_checking_block_already_exists(self):
-        source = """
+        """),
+    ),
+    'type_checking_block_already_exists': (
+        [
+            ImportItem('a', 'B'),
+            ImportItem('c.C'),
+        ],
+        dedent("""
             from __future__ import annotations
 
             from typing import TYPE_CHECKING
@@ -63,12 +52,8 @@ class TestMoveImportsToTypeCheckingBlockVisitor(CodemodTest):
 
             if TYPE_CHECKING:
                 from d import E
-        """
-        import_items_to_be_moved = [
-            ImportItem('a', 'B'),
-            ImportItem('c.C'),
-        ]
-        expected = """
+        """),
+        dedent("""
             from __future__ import annotations
 
             from typing import TYPE_CHECKING
@@ -79,35 +64,39 @@ class TestMoveImportsToTypeCheckingBlockVisitor(CodemodTest):
 
             if TYPE_CHECKING:
                 from d import E
-        """
-
-        self.run_test_case(import_items_to_be_moved, source, expected)
-
-    def test_typing_imports(self):
-        source = """
+        """),
+    ),
+    'typing_imports': (
+        [
+            ImportItem('typing', 'List'),
+            ImportItem('a', 'B'),
+        ],
+        dedent("""
             from __future__ import annotations
 
             from typing import List
 
             from a import B
-        """
-        import_items_to_be_moved = [
-            ImportItem('typing', 'List'),
-            ImportItem('a', 'B'),
-        ]
-        expected = """
+        """),
+        dedent("""
             from __future__ import annotations
 
             from typing import TYPE_CHECKING, List
 
             if TYPE_CHECKING:
                 from a import B
-        """
-
-        self.run_test_case(import_items_to_be_moved, source, expected)
-
-    def test_move_imports__mix(self):
-        source = """
+        """),
+    ),
+    'move_imports__mix': (
+        [
+            ImportItem('a', 'B'),
+            ImportItem('a', 'C'),
+            ImportItem('e'),
+            ImportItem('h', 'I'),
+            ImportItem('typing', 'List'),
+            ImportItem('typing', 'Dict'),
+        ],
+        dedent("""
             from __future__ import annotations
             from __future__ import division
 
@@ -131,16 +120,8 @@ class TestMoveImportsToTypeCheckingBlockVisitor(CodemodTest):
 
             def func():
                 pass
-        """
-        import_items_to_be_moved = [
-            ImportItem('a', 'B'),
-            ImportItem('a', 'C'),
-            ImportItem('e'),
-            ImportItem('h', 'I'),
-            ImportItem('typing', 'List'),
-            ImportItem('typing', 'Dict'),
-        ]
-        expected = """
+        """),
+        dedent("""
             from __future__ import annotations
             from __future__ import division
 
@@ -162,6 +143,36 @@ class TestMoveImportsToTypeCheckingBlockVisitor(CodemodTest):
 
             def func():
                 pass
-        """
+        """),
+    ),
+}
+
+
+class TestMoveImportsToTypeCheckingBlockVisitor(CodemodTest):
+
+    TRANSFORM: Type[Codemod] = MoveImportsToTypeCheckingBlockVisitor
+
+    def run_test_case(
+        self,
+        import_items_to_be_moved: List[ImportItem],
+        before: str,
+        after: str,
+    ) -> None:
+        context = CodemodContext()
+        MoveImportsToTypeCheckingBlockVisitor.store_imports_in_context(
+            context,
+            import_items_to_be_moved,
+        )
+        self.assertCodemod(before, after, context_override=context)
 
-        self.run_test_case(import_items_to_be_moved, source, expected)
+    def test_simple_add_type_checking(self):
+        self.run_test_case(*CASES['simple_add_type_checking'])
+
+    def test_type_checking_block_already_exists(self):
+        self.run_test_case(*CASES['type_checking_block_already_exists'])
+
+    def test_typing_imports(self):
+        self.run_test_case(*CASES['typing_imports'])
+
+    def test_move_imports__mix(self):
+        self.run_test_case(*CASES['move_imports__mix'])
@@ -50,6 +50,18 @@ from .util import Dummy
 
 VERY_LARGE_MAX_TYPED_DICT_SIZE = 200
 
+# Anonymous TypedDicts that recur across many parametrize tables below.
+TD_A_INT = make_typed_dict(required_fields={'a': int})
+TD_B_INT = make_typed_dict(required_fields={'b': int})
+TD_A_STR = make_typed_dict(required_fields={'a': str})
+TD_AB_INT = make_typed_dict(required_fields={'a': int, 'b': int})
+# Built without make_typed_dict, so it is equal to TD_A_INT but not the same
+# class; comparing the two exercises structural TypedDict equality.
+TD_A_INT_DISTINCT = TypedDict(DUMMY_TYPED_DICT_NAME, {
+    'required_fields': TypedDict(DUMMY_REQUIRED_TYPED_DICT_NAME, {'a': int}),
+    'optional_fields': TypedDict(DUMMY_OPTIONAL_TYPED_DICT_NAME, {}),
+})
+
 
 class TestTypesEqual:
     @pytest.mark.parametrize(
@@ -60,43 +72,43 @@ class TestTypesEqual:
             (Union[int, str], Union[int, str], True),
             (Union[int, str], Union[int], False),
             (Union[int, str], int, False),
-            (make_typed_dict(required_fields={'a': int}),
-             make_typed_dict(required_fields={'a': int}),
+            (TD_A_INT,
+             TD_A_INT_DISTINCT,
              True),
-            (make_typed_dict(required_fields={'a': int}),
-             make_typed_dict(required_fields={'b': int}),
+            (TD_A_INT,
+             TD_B_INT,
              False),
-            (make_typed_dict(required_fields={'a': int}), int, False),
-            (List[make_typed_dict(required_fields={'a': int})],
-             List[make_typed_dict(required_fields={'a': int})],
+            (TD_A_INT, int, False),
+            (List[TD_A_INT],
+             List[TD_A_INT_DISTINCT],
              True),
-            (List[make_typed_dict(required_fields={'a': make_typed_dict(required_fields={'a': int})})],
-             List[make_typed_dict(required_fields={'a': make_typed_dict(required_fields={'a': int})})],
+            (List[make_typed_dict(required_fields={'a': TD_A_INT})],
+             List[make_typed_dict(required_fields={'a': TD_A_INT_DISTINCT})],
              True),
-            (List[make_typed_dict(required_fields={'a': List[make_typed_dict(required_fields={'a': int})]})],
-             List[make_typed_dict(required_fields={'a': List[make_typed_dict(required_fields={'a': int})]})],
+            (List[make_typed_dict(required_fields={'a': List[TD_A_INT]})],
+             List[make_typed_dict(required_fields={'a': List[TD_A_INT_DISTINCT]})],
              True),
-            (List[make_typed_dict(required_fields={'a': int})], List[int], False),
-            (typing_Tuple[make_typed_dict(required_fields={'a': int})],
-             typing_Tuple[make_typed_dict(required_fields={'a': int})],
+            (List[TD_A_INT], List[int], False),
+            (typing_Tuple[TD_A_INT],
+             typing_Tuple[TD_A_INT_DISTINCT],
              True),
-            (typing_Tuple[make_typed_dict(required_fields={'a': int}), int],
-             typing_Tuple[make_typed_dict(required_fields={'a': int})],
+            (typing_Tuple[TD_A_INT, int],
+             typing_Tuple[TD_A_INT],
              False),
-            (List[make_typed_dict(required_fields={'a': int})],
-             typing_Tuple[make_typed_dict(required_fields={'a': int})],
+            (List[TD_A_INT],
+             typing_Tuple[TD_A_INT],
              False),
-            (Dict[str, make_typed_dict(required_fields={'a': int})],
-             Dict[str, make_typed_dict(required_fields={'a': int})],
+            (Dict[str, TD_A_INT],
+             Dict[str, TD_A_INT_DISTINCT],
              True),
-            (Dict[str, make_typed_dict(required_fields={'a': int})],
-             Dict[str, make_typed_dict(required_fields={'b': int})],
+            (Dict[str, TD_A_INT],
+             Dict[str, TD_B_INT],
              False),
-            (Set[make_typed_dict(required_fields={'a': int})],
-             Set[make_typed_dict(required_fields={'a': int})],
+            (Set[TD_A_INT],
+             Set[TD_A_INT_DISTINCT],
              True),
-            (Set[make_typed_dict(required_fields={'a': int})],
-             Set[make_typed_dict(required_fields={'b': int})],
+            (Set[TD_A_INT],
+             Set[TD_B_INT],
              False),
         ],
     )
@@ -133,6 +145,19 @@ class TestMakeTypedDict:
                                  optional_fields=optional_fields)
         assert actual == expected_type
 
+    def test_make_typed_dict_reuses_class(self):
+        first = make_typed_dict(required_fields={'a': int}, optional_fields={'b': str})
+        second = make_typed_dict(required_fields={'a': int}, optional_fields={'b': str})
+        assert first is second
+        assert make_typed_dict(required_fields={'a': str}) is not first
+
+    def test_make_typed_dict_keeps_union_order(self):
+        # Union[int, str] == Union[str, int], but stubs render the order given.
+        int_first = shrink_types((TD_A_INT, TD_A_STR), max_typed_dict_size=10)
+        str_first = shrink_types((TD_A_STR, TD_A_INT), max_typed_dict_size=10)
+        assert field_annotations(int_first)[0]['a'].__args__ == (int, str)
+        assert field_annotations(str_first)[0]['a'].__args__ == (str, int)
+
     @pytest.mark.parametrize(
         'required_fields, optional_fields',
         [
@@ -151,37 +176,37 @@ class TestShrinkType:
         [
             (
                 (
-                    make_typed_dict(required_fields={'a': int, 'b': int}),
-                    make_typed_dict(required_fields={'a': int, 'b': int}),
+                    TD_AB_INT,
+                    TD_AB_INT,
                 ),
-                make_typed_dict(required_fields={'a': int, 'b': int}),
+                TD_AB_INT,
             ),
             (
                 (
-                    make_typed_dict(required_fields={'a': int, 'b': int}),
-                    make_typed_dict(required_fields={'a': int}),
+                    TD_AB_INT,
+                    TD_A_INT,
                 ),
                 make_typed_dict(required_fields={'a': int}, optional_fields={'b': int}),
             ),
             (
                 (
-                    make_typed_dict(required_fields={'a': int, 'b': int}),
+                    TD_AB_INT,
                     make_typed_dict(required_fields={'a': int, 'c': int}),
                 ),
                 make_typed_dict(required_fields={'a': int}, optional_fields={'b': int, 'c': int}),
             ),
             (
                 (
-                    make_typed_dict(required_fields={'a': str}),
-                    make_typed_dict(required_fields={'a': int}),
+                    TD_A_STR,
+                    TD_A_INT,
                 ),
                 make_typed_dict(required_fields={'a': Union[str, int]}, optional_fields={}),
             ),
             (
                 (
-                    make_typed_dict(required_fields={'a': str}),
-                    make_typed_dict(required_fields={'a': int}),
-                    make_typed_dict(required_fields={'b': int}),
+                    TD_A_STR,
+                    TD_A_INT,
+                    TD_B_INT,
                 ),
                 make_typed_dict(required_fields={}, optional_fields={'a': Union[str, int], 'b': int}),
             ),
@@ -216,7 +241,7 @@ class TestShrinkType:
             ),
             (
                 (
-                    make_typed_dict(required_fields={'a': str}),
+                    TD_A_STR,
                     make_typed_dict(optional_fields={'a': str}),
                 ),
                 make_typed_dict(optional_fields={'a': str}),
@@ -308,59 +333,59 @@ class TestShrinkType:
             # Non-TypedDict type with just one trace.
             (
                 (
-                    List[make_typed_dict(required_fields={'a': int})],
+                    List[TD_A_INT],
                 ),
-                List[make_typed_dict(required_fields={'a': int})],
+                List[TD_A_INT],
             ),
             # Same non-TypedDict types.
             (
                 (
-                    List[make_typed_dict(required_fields={'a': int})],
-                    List[make_typed_dict(required_fields={'a': int})],
+                    List[TD_A_INT],
+                    List[TD_A_INT],
                 ),
-                List[make_typed_dict(required_fields={'a': int})],
+                List[TD_A_INT],
             ),
             # Non-TypedDict types but not all the same - convert anonymous TypedDicts to Dicts.
             (
                 (
-                    List[make_typed_dict(required_fields={'a': int})],
+                    List[TD_A_INT],
                     List[Dict[str, int]],
                 ),
                 List[Dict[str, int]],
             ),
             (
                 (
-                    List[make_typed_dict(required_fields={'a': int})],
-                    List[make_typed_dict(required_fields={'b': int})],
+                    List[TD_A_INT],
+                    List[TD_B_INT],
                 ),
                 List[make_typed_dict(optional_fields={'a': int, 'b': int})],
             ),
             (
                 (
-                    make_typed_dict(required_fields={"foo": List[make_typed_dict(required_fields={'a': int})]}),
-                    make_typed_dict(required_fields={"foo": List[make_typed_dict(required_fields={'a': int})]}),
+                    make_typed_dict(required_fields={"foo": List[TD_A_INT]}),
+                    make_typed_dict(required_fields={"foo": List[TD_A_INT]}),
                 ),
-                make_typed_dict(required_fields={"foo": List[make_typed_dict(required_fields={'a': int})]}),
+                make_typed_dict(required_fields={"foo": List[TD_A_INT]}),
             ),
             (
                 (
-                    make_typed_dict(required_fields={"foo": List[make_typed_dict(required_fields={'a': int})]}),
-                    make_typed_dict(required_fields={"foo": List[make_typed_dict(required_fields={'b': int})]}),
+                    make_typed_dict(required_fields={"foo": List[TD_A_INT]}),
+                    make_typed_dict(required_fields={"foo": List[TD_B_INT]}),
                 ),
                 make_typed_dict(required_fields={"foo": List[make_typed_dict(optional_fields={'a': int, 'b': int})]}),
             ),
             (
                 (
-                    typing_Tuple[make_typed_dict(required_fields={'a': int})],
-                    typing_Tuple[make_typed_dict(required_fields={'a': int})],
+                    typing_Tuple[TD_A_INT],
+                    typing_Tuple[TD_A_INT],
                 ),
-                typing_Tuple[make_typed_dict(required_fields={'a': int})],
+                typing_Tuple[TD_A_INT],
             ),
             # We don't currently shrink the inner types for Tuples.
             (
                 (
-                    typing_Tuple[make_typed_dict(required_fields={'a': int})],
-                    typing_Tuple[make_typed_dict(required_fields={'b': int})],
+                    typing_Tuple[TD_A_INT],
+                    typing_Tuple[TD_B_INT],
                 ),
                 typing_Tuple[Dict[str, int]],
             ),
@@ -409,15 +434,15 @@ class TestShrinkType:
             # If all are anonymous TypedDicts, we get the shrunk TypedDict.
             (
                 (
-                    make_typed_dict(required_fields={'a': int, 'b': int}),
-                    make_typed_dict(required_fields={'a': int, 'b': int}),
+                    TD_AB_INT,
+                    TD_AB_INT,
                 ),
-                make_typed_dict(required_fields={'a': int, 'b': int}),
+                TD_AB_INT,
             ),
             # If not all are anonymous TypedDicts, we get the Dict equivalents.
             (
                 (
-                    make_typed_dict(required_fields={'a': int, 'b': int}),
+                    TD_AB_INT,
                     Dict[int, int]
                 ),
                 Union[Dict[str, int], Dict[int, int]],
@@ -425,7 +450,7 @@ class TestShrinkType:
             # If not all are anonymous TypedDicts, we convert any nested TypedDicts to Dicts as well.
             (
                 (
-                    make_typed_dict(required_fields={'a': make_typed_dict(required_fields={'b': int})}),
+                    make_typed_dict(required_fields={'a': TD_B_INT}),
                     Dict[str, int]
                 ),
                 Union[Dict[str, Dict[str, int]], Dict[str, int]],
@@ -502,20 +527,32 @@ def generator() -> Iterator[int]:
     yield 1
 
 
+def one():
+    return 1
+
+
+def default_dict_of_one():
+    return defaultdict(one)
+
+
+def dict_of_ab():
+    return {'a': 1, 'b': 2}
+
+
 def get_default_dict(key, value):
-    m = defaultdict(lambda: 1)
+    m = defaultdict(one)
     m[key] += value
     return m
 
 
 def get_nested_default_dict(key, value):
-    m = defaultdict(lambda: defaultdict(lambda: 1))
+    m = defaultdict(default_dict_of_one)
     m[key][key] += value
     return m
 
 
 def get_default_dict_with_dict(key, value):
-    m = defaultdict(lambda: {'a': 1, 'b': 2})
+    m = defaultdict(dict_of_ab)
     m[key]['a'] = value
     return m
 
@@ -555,7 +592,7 @@ class TestGetType:
         [
             ({}, Dict[Any, Any], Dict[Any, Any]),
             ({'a': 1, 'b': 2}, Dict[str, int],
-             make_typed_dict(required_fields={'a': int, 'b': int})),
+             TD_AB_INT),
             ({'a': 1, 2: 'b'}, Dict[Union[str, int], Union[str, int]], Dict[Union[str, int], Union[str, int]]),
             (get_default_dict(key=1, value=1), DefaultDict[int, int], DefaultDict[int, int]),
             (get_nested_default_dict(key=1, value=1.0),
@@ -586,13 +623,13 @@ class TestGetType:
         [
             (get_default_dict_with_dict(key=1, value=3),
              DefaultDict[int, Dict[str, int]],
-             DefaultDict[int, make_typed_dict(required_fields={'a': int, 'b': int})]),
-            ([{'a': 1, 'b': 2}], List[Dict[str, int]], List[make_typed_dict(required_fields={'a': int, 'b': int})]),
+             DefaultDict[int, TD_AB_INT]),
+            ([{'a': 1, 'b': 2}], List[Dict[str, int]], List[TD_AB_INT]),
             ([{'a': 1, 'b': 2}, {'a': 1}], List[Dict[str, int]],
              List[make_typed_dict(required_fields={'a': int}, optional_fields={'b': int})]),
             (({'a': 1, 'b': 2},),
              typing_Tuple[Dict[str, int]],
-             typing_Tuple[make_typed_dict(required_fields={'a': int, 'b': int})]),
+             typing_Tuple[TD_AB_INT]),
 
         ],
     )
@@ -624,6 +661,17 @@ class TestGetType:
         """Return appropriate type for an instance of a user defined class"""
         assert get_type(Dummy(), max_typed_dict_size=VERY_LARGE_MAX_TYPED_DICT_SIZE) == Dummy
 
+    def test_instance_of_unhashable_class(self):
+        """Return the class even if the class itself is unhashable"""
+        class EqMeta(type):
+            def __eq__(cls, other):
+                return cls is other
+
+        class Unhashable(metaclass=EqMeta):
+            pass
+
+        assert get_type(Unhashable(), max_typed_dict_size=VERY_LARGE_MAX_TYPED_DICT_SIZE) is Unhashable
+
     def test_class_type(self):
         """Return the correct type for classes"""
         assert get_type(Dummy, max_typed_dict_size=VERY_LARGE_MAX_TYPED_DICT_SIZE) == Type[Dummy]
@@ -658,7 +706,7 @@ class TestTypeRewriter:
              TypedDict('Foo', {'a': TypedDict('Bar', {'b': int})})),
             (make_typed_dict(required_fields={'a': make_typed_dict(required_fields={'b': List[str]})},
                              optional_fields={'c': List[str]}),
-             make_typed_dict(required_fields={'a': make_typed_dict(required_fields={'b': int})},
+             make_typed_dict(required_fields={'a': TD_B_INT},
                              optional_fields={'c': int})),
             (T, Dict[str, T]),
             (Dict[str, T], Dict[str, Dict[str, T]]),
@@ -690,6 +738,14 @@ class TestRemoveEmptyContainers:
         rewritten = RemoveEmptyContainers().rewrite(typ)
         assert rewritten == expected
 
+    def test_keeps_members_rewritten_to_equal_types(self):
+        class RebuildTypedDicts(RemoveEmptyContainers):
+            def rewrite_anonymous_TypedDict(self, typed_dict):
+                return TD_A_INT_DISTINCT
+
+        rewritten = RebuildTypedDicts().rewrite(Union[TD_A_INT, str])
+        assert rewritten.__args__[0] is TD_A_INT_DISTINCT
+
 
 class TestRewriteConfigDict:
     @pytest.mark.parametrize(
@@ -903,9 +959,17 @@ class TestRewriteAnonymousTypedDictToDict:
             # Regular TypedDict is left untouched.
             (TypedDict('Foo', {'a': TypedDict('Bar', {'b': int})}),
              TypedDict('Foo', {'a': TypedDict('Bar', {'b': int})})),
-            (Dict[str, make_typed_dict(required_fields={'a': int})], Dict[str, Dict[str, int]]),
+            (Dict[str, TD_A_INT], Dict[str, Dict[str, int]]),
         ],
     )
     def test_rewrite(self, typ, expected):
         rewritten = RewriteAnonymousTypedDictToDict().rewrite(typ)
         assert rewritten == expected
+
+    def test_shrink_types_keeps_types_without_anonymous_typed_dict(self):
+        named = TypedDict('Foo', {'a': TypedDict('Bar', {'b': int})})
+        nested = Dict[str, List[int]]
+        shrunk = shrink_types((named, nested, TD_A_INT), max_typed_dict_size=10)
+        assert shrunk == Union[named, nested, Dict[str, int]]
+        assert shrunk.__args__[0] is named
+        assert shrunk.__args__[1] is nested
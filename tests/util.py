@@ -3,8 +3,8 @@
 #
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
-import inspect
 import os
+import sys
 from types import FrameType
 from typing import (
     Any,
@@ -18,14 +18,14 @@ from monkeytype.compat import cached_property
 class Dummy:
     @staticmethod
     def a_static_method(foo: Any) -> Optional[FrameType]:
-        return inspect.currentframe()
+        return sys._getframe(0)
 
     @classmethod
     def a_class_method(cls, foo: Any) -> Optional[FrameType]:
-        return inspect.currentframe()
+        return sys._getframe(0)
 
     def an_instance_method(self, foo: Any, bar: Any) -> Optional[FrameType]:
-        return inspect.currentframe()
+        return sys._getframe(0)
 
     def has_complex_signature(
         self,
@@ -39,24 +39,24 @@ class Dummy:
         g: Any = 0,
         **h: Any,
     ) -> Optional[FrameType]:
-        return inspect.currentframe()
+        return sys._getframe(0)
 
     @property
     def a_property(self) -> Optional[FrameType]:
-        return inspect.currentframe()
+        return sys._getframe(0)
 
     @property
     def a_settable_property(self) -> Optional[FrameType]:
-        return inspect.currentframe()
+        return sys._getframe(0)
 
     @a_settable_property.setter
     def a_settable_property(self, unused) -> Optional[FrameType]:
-        return inspect.currentframe()
+        return sys._getframe(0)
 
     if cached_property:
         @cached_property
         def a_cached_property(self) -> Optional[FrameType]:
-            return inspect.currentframe()
+            return sys._getframe(0)
 
 
 class Outer:
@@ -68,9 +68,9 @@ class Outer:
 def transform_path(path: str) -> str:
     """Transform tests/test_foo.py to monkeytype.foo"""
     path = 'monkeytype/' + path[len('tests/'):]
-    *basepath, file_name = path.split('/')
+    dirname, _, file_name = path.rpartition('/')
     basename, _ext = os.path.splitext(file_name[len('test_'):])
-    return '.'.join(basepath + [basename])
+    return dirname.replace('/', '.') + '.' + basename
 
 
 def smartcov_paths_hook(paths: List[str]) -> List[str]: